@@ -7,28 +7,100 @@ import dataclasses
 import fondat.codec
 import fondat.error
 import fondat.sql
+import functools
+import itertools
 import json
 import logging
+import random
+import time
 import types
 import typing
-import uuid
-
-from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+import weakref
+
+from collections import OrderedDict
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Mapping,
+    Sequence,
+)
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
 from fondat.codec import Codec, DecodeError, JSONCodec
 from fondat.data import datacls
+from fondat.pagination import Cursor, Page, PaginationError
 from fondat.sql import Expression, Param
 from fondat.types import is_optional, is_subclass, literal_values, strip_annotations
-from fondat.validation import validate, validate_arguments
+from fondat.validation import validate
 from types import NoneType
-from typing import Annotated, Any, Generic, Literal, TypeVar, get_args, get_origin
+from typing import Annotated, Any, Generic, Literal, TypedDict, TypeVar, get_args, get_origin
 from uuid import UUID
 
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 _logger = logging.getLogger(__name__)
+_slow_logger = logging.getLogger(f"{__name__}.slow")
+
+
+@functools.lru_cache(maxsize=1024)
+def _statement_logger(text: str) -> logging.Logger:
+    """Return the logger for statements with the command of the compiled text."""
+    command = text.split(None, 1)[0].lower() if text.strip() else "empty"
+    if not command.isalpha():
+        command = "other"
+    return logging.getLogger(f"{__name__}.statement.{command}")
+
+
+class _LogStatement:
+    """
+    Renders a compiled statement in a log message only if the message is emitted.
+
+    Parameters:
+    • text: compiled statement text
+    • args: encoded parameter values, or sequences of values for multiple executions
+    • many: whether args contains sequences of values for multiple executions
+    """
+
+    __slots__ = {"text", "args", "many"}
+
+    max_args = 20
+    max_value = 200
+
+    def __init__(self, text: str, args: Sequence[Any], many: bool = False):
+        self.text = text
+        self.args = args
+        self.many = many
+
+    def _values(self, args: Sequence[Any]) -> str:
+        values = []
+        for value in itertools.islice(args, self.max_args):
+            value = repr(value)
+            if len(value) > self.max_value:
+                value = f"{value[:self.max_value]}..."
+            values.append(value)
+        if len(args) > self.max_args:
+            values.append(f"... ({len(args) - self.max_args} more)")
+        return f"[{', '.join(values)}]"
+
+    def __str__(self) -> str:
+        if self.many:
+            if not self.args:
+                return f"{self.text} (0 executions)"
+            first = self._values(self.args[0])
+            return f"{self.text} ({len(self.args)} executions, first: {first})"
+        if not self.args:
+            return self.text
+        return f"{self.text} {self._values(self.args)}"
 
 
 PT = TypeVar("PT")  # python type
@@ -40,20 +112,92 @@ T = TypeVar("T")
 
 
 class PostgreSQLCodec(Codec[PT, Any]):
-    """Base class for PostgreSQL codecs."""
+    """
+    Base class for PostgreSQL codecs.
+
+    Attributes:
+    • validation: validation of values by passthrough codecs
+
+    Passthrough codecs hand values to and from asyncpg unchanged. Their validation level
+    is one of: "strict" to validate values to encode and decode, "encode" to only validate
+    values to encode, or "off" to perform no validation.
+    """
 
     _cache = {}
 
+    validation: Literal["strict", "encode", "off"] = "off"
+
+    @classmethod
+    def get(cls, python_type: Any) -> "PostgreSQLCodec[PT]":
+        """
+        Return a codec that handles the specified Python type.
+
+        Resolved codecs are cached by type. A type that is not hashable, such as one annotated
+        with unhashable metadata, is cached by a key normalized from its structure.
+        """
+        try:
+            key = _type_key(python_type)
+        except TypeError:
+            key = None
+        if key is not None:
+            try:
+                return cls._cache[key]
+            except KeyError:
+                pass
+        try:
+            codec_class = _DISPATCH.get(strip_annotations(python_type))
+        except TypeError:  # unhashable
+            codec_class = None
+        if codec_class is None or not issubclass(codec_class, cls):
+            subclasses = cls.__subclasses__()
+            for codec_class in subclasses:
+                if codec_class is not JSONBCodec and codec_class.handles(python_type):
+                    break
+            else:
+                if JSONBCodec not in subclasses:
+                    raise TypeError(f"no codec for {python_type}")
+                codec_class = JSONBCodec  # fallback codec; no need to scan again
+        codec = codec_class(python_type)
+        if key is not None:
+            cls._cache[key] = codec
+        return codec
+
+
+def _type_key(python_type: Any) -> Any:
+    """
+    Return a hashable key that identifies a Python type. A hashable type is its own key.
+    Unhashable annotation metadata is identified by object identity; a cached codec or
+    statement references the type, which keeps the metadata alive while it is cached.
+    Raises TypeError if no key can be formed.
+    """
+    try:
+        hash(python_type)
+        return python_type
+    except TypeError:
+        pass
+    origin = get_origin(python_type)
+    if origin is None:
+        raise TypeError(f"cannot form key for type: {python_type!r}")
+    if origin is Annotated:
+        return (
+            Annotated,
+            _type_key(python_type.__origin__),
+            tuple(id(m) for m in python_type.__metadata__),
+        )
+    return (type(python_type), origin, tuple(_type_key(a) for a in get_args(python_type)))
+
 
 class _PassthroughCodec(Generic[PT]):
     """..."""
 
-    @validate_arguments
     def encode(self, value: PT) -> PT:
+        if self.validation != "off":
+            validate(value, self.python_type)
         return value
 
-    @validate_arguments
     def decode(self, value: PT) -> PT:
+        if self.validation == "strict":
+            validate(value, self.python_type)
         return value
 
 
@@ -101,8 +245,9 @@ class BytearrayCodec(_PassthroughCodec[bytearray], PostgreSQLCodec[bytearray]):
         python_type = strip_annotations(python_type)
         return is_subclass(python_type, bytearray)
 
-    @validate_arguments
     def decode(self, value: bytes | bytearray) -> bytearray:
+        if self.validation == "strict":
+            validate(value, bytes | bytearray)
         return value if isinstance(value, bytearray) else bytearray(value)
 
 
@@ -123,8 +268,9 @@ class BoolCodec(_PassthroughCodec[bool], PostgreSQLCodec[bool]):
         python_type = strip_annotations(python_type)
         return is_subclass(python_type, bool)
 
-    @validate_arguments
     def decode(self, value: int | bool) -> bool:
+        if self.validation == "strict":
+            validate(value, int | bool)
         return bool(value)
 
 
@@ -156,7 +302,12 @@ class UUIDCodec(_PassthroughCodec[UUID], PostgreSQLCodec[UUID]):
 
 
 class ArrayCodec(PostgreSQLCodec[PT]):
-    """..."""
+    """
+    Codec that encodes/decodes an iterable value to/from a SQL array. If elements are handled
+    by a passthrough codec, arrays are handed to and from asyncpg without encoding or decoding
+    each element; values to encode can then also be array-backed, such as `array.array` or
+    NumPy arrays.
+    """
 
     _AVOID = str | bytes | bytearray | Mapping | tuple
 
@@ -176,11 +327,26 @@ class ArrayCodec(PostgreSQLCodec[PT]):
         python_type = strip_annotations(python_type)
         self.codec = PostgreSQLCodec.get(get_args(python_type)[0])
         self.sql_type = f"{self.codec.sql_type}[]"
+        self._origin = get_origin(python_type) or python_type
+        codec_type = type(self.codec)
+        self._passthrough = (
+            isinstance(self.codec, _PassthroughCodec)
+            and codec_type.encode is _PassthroughCodec.encode
+            and codec_type.decode is _PassthroughCodec.decode
+        )
 
     def encode(self, value: PT) -> Any:
+        if self._passthrough and self.codec.validation == "off":
+            if isinstance(value, list):
+                return value
+            if hasattr(value, "tolist"):  # array.array or numpy.ndarray
+                return value.tolist()
+            return list(value)
         return [self.codec.encode(v) for v in value]
 
     def decode(self, value: Any) -> PT:
+        if self._passthrough and self.codec.validation != "strict":
+            return value if self._origin is list else self.python_type(value)
         return self.python_type(self.codec.decode(v) for v in value)
 
 
@@ -252,10 +418,51 @@ class LiteralCodec(PostgreSQLCodec[PT]):
         return result
 
 
+_DISPATCH = {  # exact Python types → codec classes, to avoid scanning codec classes
+    str: StrCodec,
+    float: FloatCodec,
+    Decimal: DecimalCodec,
+    bytes: BytesCodec,
+    bytearray: BytearrayCodec,
+    int: IntCodec,
+    bool: BoolCodec,
+    date: DateCodec,
+    datetime: DatetimeCodec,
+    UUID: UUIDCodec,
+}
+
+
+_JSONB_VERSION = b"\x01"  # binary jsonb format version
+
+
+def _jsonb_encode(value: Any) -> bytes:
+    if orjson:
+        try:
+            return _JSONB_VERSION + orjson.dumps(value)
+        except orjson.JSONEncodeError:  # such as integer exceeding 64 bits
+            pass
+    return _JSONB_VERSION + json.dumps(value, separators=(",", ":")).encode()
+
+
+def _jsonb_decode(data: bytes) -> Any:
+    if orjson:
+        try:
+            return orjson.loads(data[1:])
+        except orjson.JSONDecodeError:  # such as number exceeding double range
+            pass
+    return json.loads(data[1:])
+
+
 class JSONBCodec(PostgreSQLCodec[PT]):
     """
     Codec that encodes/decodes a value to/from a SQL JSONB value. This is the "fallback" codec,
     which handles any type not handled by any other codec.
+
+    Values are encoded to, and decoded from, JSON-compatible structures; serialization is
+    performed by the JSONB type codec registered with each database connection, using
+    orjson if it is installed. A parameter encoded by this codec must be known by the
+    database to be JSONB; where its type cannot be inferred from its use in a statement
+    (for example, "SELECT $1"), the parameter requires an explicit "::JSONB" cast.
     """
 
     sql_type = "JSONB"
@@ -273,37 +480,298 @@ class JSONBCodec(PostgreSQLCodec[PT]):
         self.codec = JSONCodec.get(python_type)
 
     def encode(self, value: PT) -> Any:
-        return json.dumps(self.codec.encode(value))
+        return self.codec.encode(value)
 
     def decode(self, value: Any) -> PT:
-        return self.codec.decode(json.loads(value))
+        return self.codec.decode(value)
 
 
-class _Results(AsyncIterator[T]):
-    __slots__ = {"statement", "result", "rows", "codecs"}
+_CONNECT_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError)
 
-    def __init__(self, statement, result, rows):
-        self.statement = statement
-        self.result = result
-        self.rows = rows
-        self.codecs = {
+
+_MAX_PARAMS = 32767  # maximum number of parameters in a statement
+_REPLICA_RETRY = (1.0, 60.0)  # minimum and maximum seconds before retrying replica pool
+_SAMPLE_BLOCKS = 32  # table blocks to sample per partition to estimate key boundaries
+
+
+def _rowcount(status: str) -> int:
+    """Return the number of rows affected from a command status string."""
+    count = status.rsplit(" ", 1)[-1]
+    return int(count) if count.isdigit() else 0
+
+
+class _Statement:
+    """Compiled statement text and parameter encoders."""
+
+    __slots__ = {"text", "encoders"}
+
+    def __init__(self, text: str, encoders: list[Callable[[Any], Any]]):
+        self.text = text
+        self.encoders = encoders
+
+
+class StatementCache:
+    """
+    Least-recently-used cache of compiled statements.
+
+    Parameters:
+    • size: maximum number of compiled statements to retain; 0 disables caching
+
+    Statements are keyed by their shape: string fragments, and the types of parameters.
+    A cached statement provides its SQL text with `$n` placeholders, and the encoders for
+    its parameters, avoiding text rendering and codec resolution on subsequent executions.
+
+    Attributes:
+    • hits: number of statements resolved from the cache
+    • misses: number of statements compiled because they were not cached
+    """
+
+    __slots__ = {"size", "hits", "misses", "_statements"}
+
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._statements = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def clear(self) -> None:
+        """Remove all compiled statements from the cache, and reset counters."""
+        self._statements.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, statement: Expression) -> tuple[str, list[Any]]:
+        """Return compiled SQL text and encoded parameter values for a statement."""
+        compiled, values = self._get(statement)
+        return compiled.text, [encode(v) for encode, v in zip(compiled.encoders, values)]
+
+    def compile_many(
+        self, statement: Expression, args: Iterable[Sequence[Any]]
+    ) -> tuple[str, list[list[Any]]]:
+        """
+        Return compiled SQL text for a statement, and encoded parameter values for each
+        sequence of parameter values. Parameter values in the statement are ignored.
+        """
+        compiled, _ = self._get(statement)
+        encoders = compiled.encoders
+        return compiled.text, [
+            [encode(v) for encode, v in zip(encoders, values, strict=True)] for values in args
+        ]
+
+    def _get(self, statement: Expression) -> tuple[_Statement, list[Any]]:
+        """Return compiled statement and its parameter values."""
+        key = []
+        values = []
+        for fragment in statement:
+            if isinstance(fragment, str):
+                key.append(fragment)
+            else:
+                key.append(fragment.type)
+                values.append(fragment.value)
+        try:
+            key = tuple(_type_key(k) if not isinstance(k, str) else k for k in key)
+            compiled = self._statements.get(key)
+        except TypeError:  # no key for parameter type
+            key = None
+            compiled = None
+        if compiled is not None:
+            self.hits += 1
+            self._statements.move_to_end(key)
+        else:
+            self.misses += 1
+            compiled = self._compile(statement)
+            if key is not None and self.size > 0:
+                self._statements[key] = compiled
+                if len(self._statements) > self.size:
+                    self._statements.popitem(last=False)
+        return compiled, values
+
+    @staticmethod
+    def _compile(statement: Expression) -> _Statement:
+        text = []
+        encoders = []
+        for fragment in statement:
+            if isinstance(fragment, str):
+                text.append(fragment)
+            else:
+                encoders.append(PostgreSQLCodec.get(fragment.type).encode)
+                text.append(f"${len(encoders)}")
+        return _Statement("".join(text), encoders)
+
+
+def _is_passthrough(codec: PostgreSQLCodec) -> bool:
+    """Return True if the codec decodes values without transforming them."""
+    if isinstance(codec, UnionCodec):
+        return codec.is_nullable and _is_passthrough(codec.codec)
+    return (
+        isinstance(codec, _PassthroughCodec)
+        and type(codec).decode is _PassthroughCodec.decode
+        and codec.validation != "strict"
+    )
+
+
+class _RowDecoder(Generic[T]):
+    """
+    Decodes result rows into dataclass or TypedDict objects.
+
+    Columns with passthrough codecs are copied without being decoded. Decode errors are
+    reported with the path of the column that failed to decode.
+    """
+
+    __slots__ = {"validation", "decoders", "__weakref__"}
+
+    _cache = weakref.WeakKeyDictionary()  # result types can be transient; not referenced
+
+    @classmethod
+    def get(cls, result: type[T]) -> "_RowDecoder[T]":
+        """Return a row decoder for the specified result type."""
+        decoder = cls._cache.get(result)
+        if decoder is None or decoder.validation != PostgreSQLCodec.validation:
+            decoder = cls._cache[result] = cls(result)
+        return decoder
+
+    def __init__(self, result: type[T]):
+        self.validation = PostgreSQLCodec.validation
+        codecs = {
             k: PostgreSQLCodec.get(t)
             for k, t in typing.get_type_hints(result, include_extras=True).items()
         }
+        # in order of type hints; decode is None for passthrough columns
+        self.decoders = tuple(
+            (k, None if _is_passthrough(c) else c.decode) for k, c in codecs.items()
+        )
+
+    def decode(self, row: Mapping[str, Any], result: type[T]) -> T:
+        build = {}
+        for key, decode in self.decoders:
+            if decode is None:
+                build[key] = row[key]
+                continue
+            try:
+                build[key] = decode(row[key])
+            except DecodeError:
+                with DecodeError.path_on_error(key):
+                    raise
+        return result(**build)
+
+
+class _Results(AsyncIterator[T]):
+    """
+    Asynchronous iterator of query result rows.
+
+    Rows are either read through a cursor as they are iterated, or were fetched in their
+    entirety when the statement was executed.
+
+    If a function is provided to be called when a cursor is exhausted, it is called with
+    the time spent waiting for rows from the database, and the number of rows returned.
+    """
+
+    __slots__ = {
+        "statement",
+        "result",
+        "cursor",
+        "prefetch",
+        "rows",
+        "records",
+        "decoder",
+        "strict",
+        "on_done",
+        "elapsed",
+        "count",
+    }
+
+    def __init__(
+        self,
+        statement,
+        result,
+        *,
+        cursor=None,
+        prefetch=None,
+        records=None,
+        strict=False,
+        on_done=None,
+    ):
+        self.statement = statement
+        self.result = result
+        self.cursor = cursor  # function to open cursor, until rows are iterated or fetched
+        self.prefetch = prefetch
+        self.rows = None  # cursor iterator
+        self.records = iter(records) if records is not None else None
+        self.decoder = _RowDecoder.get(result)
+        self.strict = strict
+        self.on_done = on_done
+        self.elapsed = 0.0
+        self.count = 0
 
     def __aiter__(self):
         return self
 
     async def __anext__(self) -> T:
-        row = await anext(self.rows)
-        build = {}
-        for key in self.codecs:
-            with DecodeError.path_on_error(key):
-                build[key] = self.codecs[key].decode(row[key])
-        result = self.result(**build)
-        validate(result, self.result)
+        if self.records is not None:
+            record = next(self.records, None)
+            if record is None:
+                raise StopAsyncIteration
+        else:
+            if self.rows is None:
+                if self.cursor is None:
+                    raise RuntimeError("results are being fetched in batches")
+                self.rows = self.cursor(prefetch=self.prefetch).__aiter__()
+                self.cursor = None
+            if self.on_done is None:
+                record = await anext(self.rows)
+            else:
+                start = time.perf_counter()
+                record = await anext(self.rows, None)
+                self.elapsed += time.perf_counter() - start
+                if record is None:
+                    self._done()
+                    raise StopAsyncIteration
+                self.count += 1
+        return self._decode(record)
+
+    async def fetch_batches(self, size: int | None = None) -> AsyncIterator[list[T]]:
+        """
+        Return an asynchronous iterator of lists of result rows.
+
+        Parameters:
+        • size: maximum number of rows in each list, or None for the default size
+
+        If rows are read through a cursor, the default size is the cursor prefetch size;
+        otherwise, all remaining rows are returned in a single list.
+        """
+        if self.records is not None:
+            while batch := list(itertools.islice(self.records, size)):
+                yield [self._decode(record) for record in batch]
+            return
+        if self.cursor is None:
+            raise RuntimeError("results are being iterated")
+        cursor = self.cursor
+        self.cursor = None
+        size = size or self.prefetch or 50  # asyncpg default prefetch
+        start = time.perf_counter()
+        cursor = await cursor()
+        while batch := await cursor.fetch(size):
+            self.elapsed += time.perf_counter() - start
+            self.count += len(batch)
+            yield [self._decode(record) for record in batch]
+            start = time.perf_counter()
+        self.elapsed += time.perf_counter() - start
+        self._done()
+
+    def _decode(self, record: Mapping[str, Any]) -> T:
+        result = self.decoder.decode(record, self.result)
+        if self.strict:
+            validate(result, self.result)
         return result
 
+    def _done(self) -> None:
+        if self.on_done is not None:
+            on_done, self.on_done = self.on_done, None
+            on_done(self.elapsed, self.count)
+
 
 # fmt: off
 @datacls
@@ -325,6 +793,62 @@ class Config:
 # fmt: on
 
 
+MetricsSink = Callable[[str, float, Mapping[str, Any]], None]
+BeforeExecute = Callable[[str, int], None]
+AfterExecute = Callable[[str, int, float, int], None]
+
+
+@dataclass
+class PoolStats:
+    """
+    Statistics of a database connection pool.
+
+    Attributes:
+    • role: role of database the pool connects to
+    • size: number of connections in the pool
+    • idle: number of idle connections in the pool
+    • busy: number of connections in use
+    • min_size: minimum number of connections in the pool
+    • max_size: maximum number of connections in the pool
+    """
+
+    role: Literal["primary", "replica"]
+    size: int
+    idle: int
+    busy: int
+    min_size: int
+    max_size: int
+
+
+_transaction_ids = itertools.count(1)
+
+
+class TransactionContext:
+    """
+    Describes a transaction in which statements are executed.
+
+    Attributes:
+    • id: identifier of transaction, unique within the process
+    • start: performance counter value when transaction began
+    • statements: number of statements executed in the transaction
+    • connection: connection in which transaction is performed
+    """
+
+    __slots__ = {"id", "start", "statements", "connection"}
+
+    def __init__(self):
+        self.id = next(_transaction_ids)
+        self.start = time.perf_counter()
+        self.statements = 0
+        self.connection = None
+
+    def __repr__(self) -> str:
+        return f"TransactionContext(id={self.id}, statements={self.statements})"
+
+
+Isolation = Literal["serializable", "repeatable_read", "read_committed"]
+
+
 @asynccontextmanager
 async def _async_null_context():
     yield
@@ -336,17 +860,76 @@ class Database(fondat.sql.Database):
 
     Parameters:
     • config: connection pool configuration
+    • statement_cache_size: maximum number of compiled statements to cache
+    • prepared_statement_cache_size: maximum number of prepared statements per connection
+    • strict: validate each result row returned from a query
+    • replicas: connection pool configurations of read replica databases
+    • replica_selection: method to select a replica for a read-only transaction
+    • metrics: function to receive measurements
+    • slow_query_threshold: seconds of execution after which a statement is logged as slow
+    • slow_query_sample_rate: fraction of slow statements to log
+    • debug_sample_rate: fraction of executed statements to log when debugging
+    • settings: server configuration parameters to set on each connection
+    • setup: statements to execute on each primary connection as it joins the pool
+    • replica_setup: statements to execute on each replica connection as it joins the pool
+
+    Attributes:
+    • statement_cache: cache of compiled statements
+    • before_execute: functions called with statement text and parameter count
+    • after_execute: functions called with statement text, parameter count, duration, rows
 
     The connection pool will be initialized on the first connection request, or it can be
     explicitly initialized using the `init` method.
+
+    Read-only transactions are routed to replicas, selected either in round-robin order or
+    by the fewest connections in use. If a connection cannot be acquired from a replica,
+    another replica is tried, followed by the primary database.
     """
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        *,
+        statement_cache_size: int = 1024,
+        prepared_statement_cache_size: int = 100,
+        strict: bool = False,
+        replicas: Iterable[Config] = (),
+        replica_selection: Literal["round-robin", "least-connections"] = "round-robin",
+        metrics: MetricsSink | None = None,
+        slow_query_threshold: float | None = None,
+        slow_query_sample_rate: float = 1.0,
+        debug_sample_rate: float = 1.0,
+        settings: Mapping[str, str] | None = None,
+        setup: Iterable[Expression] = (),
+        replica_setup: Iterable[Expression] = (),
+    ):
         self._config = config
+        self.statement_cache = StatementCache(statement_cache_size)
+        self._prepared_statement_cache_size = prepared_statement_cache_size
+        self._prepared = {}
+        self._strict = strict
         self._conn = contextvars.ContextVar("fondat_postgresql_conn", default=None)
         self._txn = contextvars.ContextVar("fondat_postgresql_txn", default=None)
         self._task = contextvars.ContextVar("fondat_postgresql_task", default=None)
         self._pool = None
+        self._replicas = list(replicas)
+        self._replica_selection = replica_selection
+        self._replica_pools = []  # (pool, config)
+        self._replica_index = 0
+        self._replica_retry = {}  # unavailable replica index → (retry time, backoff)
+        self._replica_tasks = set()
+        self._metrics = metrics
+        self._slow_query_threshold = slow_query_threshold
+        self._slow_query_sample_rate = slow_query_sample_rate
+        self._debug_sample_rate = debug_sample_rate
+        self._settings = dict(settings) if settings else None
+        self._setup = [self.statement_cache.compile(statement) for statement in setup]
+        self._replica_setup = [self.statement_cache.compile(s) for s in replica_setup]
+        # execute hooks receive compiled statement text, not parameter values; for a query
+        # read through a cursor, after hooks are called when results are exhausted, with
+        # time spent fetching rows; batched executions report executions as rows
+        self.before_execute: list[BeforeExecute] = []
+        self.after_execute: list[AfterExecute] = []
 
     @classmethod
     async def new(cls, config: Config) -> "Database":
@@ -363,21 +946,234 @@ class Database(fondat.sql.Database):
         return self
 
     async def init(self) -> None:
-        """Create database connection pool."""
+        """
+        Create database connection pools.
+
+        The primary pool opens its minimum number of connections, each opened with server
+        settings, then initialized with type codecs, setup statements and registered
+        prepared statements. Session state is reset as connections are released to the
+        pool, except for server settings; setup statements should not change settings.
+        Replica pools are created in the background, without delaying the primary pool; a
+        replica whose pool cannot be created is retried, with increasing delays.
+        """
         if not self._pool:
             _logger.debug("create connection pool")
-            self._pool = await asyncpg.create_pool(
-                **{k: v for k, v in dataclasses.asdict(self._config).items() if v is not None}
+            self._pool = await self._create_pool(self._config)
+            # replica pools are created in the background; reads use primary until ready
+            self._replica_retry = {
+                index: (0.0, _REPLICA_RETRY[0] / 2) for index in range(len(self._replicas))
+            }
+            self._retry_replicas()
+            _logger.debug(
+                "connection pools initialized: %s",
+                ", ".join(f"{s.role}={s.size}" for s in self.pool_stats()),
             )
 
+    async def ready(self) -> bool:
+        """
+        Initialize connection pools if required, and return whether the primary database
+        responds to a query.
+        """
+        try:
+            await self.init()
+            async with self._pool.acquire(timeout=self._config.timeout) as connection:
+                await connection.fetchval("SELECT 1;")
+        except _CONNECT_ERRORS as e:
+            _logger.warning("database not ready: %s", e)
+            return False
+        return True
+
+    async def _create_replica_pool(self, index: int) -> None:
+        """Create a replica connection pool; if unavailable, schedule a retry with backoff."""
+        config = self._replicas[index]
+        _logger.debug("create replica connection pool")
+        try:
+            pool = await self._create_pool(config, replica=True)
+        except _CONNECT_ERRORS as e:
+            _, backoff = self._replica_retry.get(index, (0.0, _REPLICA_RETRY[0] / 2))
+            backoff = min(backoff * 2, _REPLICA_RETRY[1])
+            self._replica_retry[index] = (time.monotonic() + backoff, backoff)
+            _logger.warning("replica connection pool unavailable: %s", e)
+            return
+        self._replica_retry.pop(index, None)
+        if not self._pool:  # closed while creating
+            await pool.close()
+            return
+        self._replica_pools.append((pool, config))
+
+    async def _create_pool(self, config: Config, replica: bool = False) -> asyncpg.Pool:
+        return await asyncpg.create_pool(
+            **{k: v for k, v in dataclasses.asdict(config).items() if v is not None},
+            statement_cache_size=self._prepared_statement_cache_size,
+            server_settings=self._settings,
+            init=functools.partial(self._init_connection, replica=replica),
+        )
+
+    async def _init_connection(self, connection: asyncpg.Connection, replica: bool) -> None:
+        """
+        Initialize a new connection as it joins the pool.
+
+        Setup statements are specific to the primary or replica databases, as statements
+        that write or change schema fail on a hot standby replica. Registered statements
+        are prepared on all connections; a statement that cannot be prepared on a replica
+        connection is logged and skipped.
+        """
+        await connection.set_type_codec(
+            "jsonb",
+            schema="pg_catalog",
+            encoder=_jsonb_encode,
+            decoder=_jsonb_decode,
+            format="binary",
+        )
+        for text, args in self._replica_setup if replica else self._setup:
+            await connection.execute(text, *args)
+        for text in self._prepared:
+            # executing with no arguments prepares statement into connection cache
+            try:
+                await connection.executemany(text, ())
+            except asyncpg.PostgresError as e:
+                if not replica:
+                    raise
+                _logger.warning("cannot prepare statement on replica connection: %s", e)
+
+    def prepare(self, statement: Expression) -> None:
+        """
+        Register a statement to be prepared on each connection as it joins the pool.
+
+        Parameters:
+        • statement: statement to prepare; parameter values are ignored
+
+        Statements with parameters are prepared on each pooled connection as they are
+        executed, and retained in a least-recently-used cache for that connection. A
+        registered statement is prepared in connections established after it is
+        registered; ideally, statements should be registered before the connection pool is
+        initialized.
+        """
+        text, _ = self.statement_cache.compile(statement)
+        self._prepared[text] = None
+
+    async def prepared_statements(self) -> list[str]:
+        """
+        Return the text of statements prepared on the current connection. Must be called
+        within a database connection context.
+        """
+        conn = self._conn.get()
+        if not conn:
+            raise RuntimeError("connection context required to inspect prepared statements")
+        rows = await conn.fetch("SELECT statement FROM pg_prepared_statements;")
+        return [row["statement"] for row in rows]
+
     async def close(self) -> None:
-        """Close database connection pool."""
+        """Close database connection pools."""
         if self._pool:
             await self._pool.close()
         self._pool = None
+        for task in self._replica_tasks:
+            task.cancel()
+        await asyncio.gather(*self._replica_tasks, return_exceptions=True)
+        for pool, _ in self._replica_pools:
+            await pool.close()
+        self._replica_pools = []
+        self._replica_retry = {}
+
+    def pool_stats(self) -> list[PoolStats]:
+        """Return statistics of initialized connection pools, primary pool first."""
+        pools = [("primary", self._pool)] if self._pool else []
+        pools.extend(("replica", pool) for pool, _ in self._replica_pools)
+        return [
+            PoolStats(
+                role=role,
+                size=pool.get_size(),
+                idle=pool.get_idle_size(),
+                busy=pool.get_size() - pool.get_idle_size(),
+                min_size=pool.get_min_size(),
+                max_size=pool.get_max_size(),
+            )
+            for role, pool in pools
+        ]
+
+    def _emit(self, name: str, value: float, **attributes: Any) -> None:
+        """
+        Provide a measurement to the metrics function, with a name, value and mapping of
+        attributes, suitable for recording in a histogram or counter:
+        • pool.acquire.time: seconds to acquire a connection from a pool
+        • pool.acquire.timeout: count of timeouts acquiring a connection from a pool
+        • transaction.duration: seconds from beginning to end of a transaction
+        • statement.duration: seconds spent waiting on the database to execute a statement
+        • statement.rows: number of rows returned or affected by a statement
+        """
+        try:
+            self._metrics(name, value, attributes)
+        except Exception:
+            _logger.exception("metrics function failed")
+
+    def _select_replicas(self) -> list[tuple[asyncpg.Pool, Config]]:
+        """Return replica pools, in the order they should be tried."""
+        if self._replica_retry:
+            self._retry_replicas()
+        pools = self._replica_pools
+        if not pools:
+            return []
+        if self._replica_selection == "least-connections":
+            return sorted(pools, key=lambda p: p[0].get_size() - p[0].get_idle_size())
+        index = self._replica_index % len(pools)
+        self._replica_index = index + 1
+        return pools[index:] + pools[:index]
+
+    def _retry_replicas(self) -> None:
+        """Retry creating unavailable replica pools in the background, if due."""
+        now = time.monotonic()
+        for index, (retry, backoff) in list(self._replica_retry.items()):
+            if retry <= now:
+                self._replica_retry[index] = (float("inf"), backoff)  # until task completes
+                task = asyncio.create_task(self._create_replica_pool(index))
+                self._replica_tasks.add(task)
+                task.add_done_callback(self._replica_tasks.discard)
 
     @asynccontextmanager
-    async def connection(self) -> AsyncIterator[None]:
+    async def _acquire(self, readonly: bool) -> AsyncIterator[asyncpg.Connection]:
+        """Acquire a connection from a replica pool if read-only, or from the primary pool."""
+        for pool, config in self._select_replicas() if readonly else ():
+            try:
+                connection = await self._acquire_from(pool, config, "replica")
+            except _CONNECT_ERRORS as e:
+                _logger.warning("cannot acquire connection from replica pool: %s", e)
+                continue
+            try:
+                yield connection
+            finally:
+                await pool.release(connection)
+            return
+        connection = await self._acquire_from(self._pool, self._config, "primary")
+        try:
+            yield connection
+        finally:
+            await self._pool.release(connection)
+
+    async def _acquire_from(
+        self, pool: asyncpg.Pool, config: Config, role: str
+    ) -> asyncpg.Connection:
+        if self._metrics is None:
+            return await pool.acquire(timeout=config.timeout)
+        start = time.perf_counter()
+        try:
+            connection = await pool.acquire(timeout=config.timeout)
+        except asyncio.TimeoutError:
+            self._emit("pool.acquire.timeout", 1, pool=role)
+            raise
+        self._emit("pool.acquire.time", time.perf_counter() - start, pool=role)
+        return connection
+
+    @asynccontextmanager
+    async def connection(self, readonly: bool = False) -> AsyncIterator[None]:
+        """
+        Return an asynchronous context manager, which scopes a connection in which
+        statement(s) are executed. If a connection is already established in the current
+        task, it is used.
+
+        Parameters:
+        • readonly: connection is only used to read, and can be acquired from a replica
+        """
         task = asyncio.current_task()
         if self._conn.get() and self._task.get() is task:
             yield  # connection already established
@@ -385,7 +1181,7 @@ class Database(fondat.sql.Database):
         await self.init()
         _logger.debug("acquire connection from pool")
         self._task.set(task)
-        async with self._pool.acquire(timeout=self._config.timeout) as connection:
+        async with self._acquire(readonly) as connection:
             self._conn.set(connection)
             try:
                 yield
@@ -394,33 +1190,94 @@ class Database(fondat.sql.Database):
                 self._conn.set(None)
 
     @asynccontextmanager
-    async def transaction(self) -> AsyncIterator[None]:
+    async def transaction(
+        self,
+        *,
+        isolation: Isolation | None = None,
+        readonly: bool = False,
+        deferrable: bool = False,
+        join: bool = False,
+        snapshot: str | None = None,
+    ) -> AsyncIterator[TransactionContext]:
         """
         Return an asynchronous context manager, which scopes a transaction in which
         statement(s) are executed. Upon exit of the context, if an exception was raised,
-        changes will be rolled back; otherwise changes will be committed.
-        """
-        txid = uuid.uuid4().hex
-        _logger.debug("transaction begin %s", txid)
-        token = self._txn.set(txid)
-        async with self.connection():
-            connection = self._conn.get()
-            transaction = connection.transaction()
+        changes will be rolled back; otherwise changes will be committed. The context
+        manager provides an object that describes the transaction.
+
+        Parameters:
+        • isolation: transaction isolation level, or None for the database default
+        • readonly: transaction is read-only, and can be routed to a replica
+        • deferrable: defer start until a serializable read-only transaction can run
+          without risk of serialization failure
+        • join: join an enclosing transaction, rather than nesting within it
+        • snapshot: identifier of exported snapshot for the transaction to use
+
+        A nested transaction is established with a savepoint, allowing its changes to be
+        rolled back without rolling back its enclosing transaction. It cannot specify an
+        isolation level that differs from that of its enclosing transaction; its read-only
+        and deferrable modes are ignored.
+
+        A joined transaction issues no statements to the database; it provides the
+        enclosing transaction, and an exception raised within it rolls back the enclosing
+        transaction when propagated. Its modes are ignored. If there is no enclosing
+        transaction in the current task, a new transaction is started.
+
+        A transaction that uses an exported snapshot sees the same data as the transaction
+        that exported it; it cannot be nested, is performed on the primary database, and
+        defaults to repeatable read isolation.
+        """
+        outer = self._txn.get()
+        nested = (  # enclosing transaction is on the connection of the current task
+            outer is not None
+            and outer.connection is self._conn.get()
+            and self._task.get() is asyncio.current_task()
+        )
+        if join and nested:
+            yield outer
+            return
+        if snapshot is not None:
+            if nested:
+                raise RuntimeError("nested transaction cannot use exported snapshot")
+            isolation = isolation or "repeatable_read"
+        txn = TransactionContext()
+        _logger.debug("transaction begin %s", txn.id)
+        token = self._txn.set(txn)
+        async with self.connection(readonly and snapshot is None):
+            connection = txn.connection = self._conn.get()
+            transaction = connection.transaction(
+                isolation=isolation, readonly=readonly, deferrable=deferrable
+            )
             await transaction.start()
 
             async def commit():
-                _logger.debug("transaction commit %s", txid)
+                _logger.debug("transaction commit %s", txn.id)
                 await transaction.commit()
+                if self._metrics is not None:
+                    self._emit(
+                        "transaction.duration",
+                        time.perf_counter() - txn.start,
+                        outcome="commit",
+                    )
 
             async def rollback():
-                _logger.debug("transaction rollback %s", txid)
+                _logger.debug("transaction rollback %s", txn.id)
                 await transaction.rollback()
+                if self._metrics is not None:
+                    self._emit(
+                        "transaction.duration",
+                        time.perf_counter() - txn.start,
+                        outcome="rollback",
+                    )
 
             try:
-                yield
+                if snapshot is not None:
+                    snapshot = snapshot.replace("'", "''")
+                    await connection.execute(f"SET TRANSACTION SNAPSHOT '{snapshot}';")
+                yield txn
             except GeneratorExit:  # explicit cleanup of asynchronous generator
                 await commit()
-            except Exception:
+            except BaseException:  # including cancellation
                 await rollback()
                 raise
             else:
@@ -428,10 +1285,74 @@ class Database(fondat.sql.Database):
             finally:
                 self._txn.reset(token)
 
+    def current_transaction(self) -> TransactionContext | None:
+        """Return the innermost transaction in the current context, or None."""
+        return self._txn.get()
+
+    async def export_snapshot(self) -> str:
+        """
+        Export the snapshot of the current transaction, and return its identifier. The
+        snapshot can be used by other transactions until the current transaction ends.
+        Must be called within a database transaction context.
+        """
+        txn = self._txn.get()
+        if not txn:
+            raise RuntimeError("transaction context required to export snapshot")
+        txn.statements += 1
+        return await self._conn.get().fetchval("SELECT pg_export_snapshot();")
+
+    async def gather(self, *functions: Callable[[], Awaitable[T]]) -> list[T]:
+        """
+        Call functions concurrently, each in a separate task and transaction that uses the
+        snapshot of the current transaction, and return their results in order.
+
+        Parameters:
+        • functions: functions returning awaitables that execute statements
+
+        Each transaction acquires its own connection from the primary database pool, and
+        is read-only. For reads to be consistent with the current transaction, it should
+        have repeatable read or serializable isolation, and be performed on the primary
+        database. If a function raises an exception, the others are cancelled.
+        Must be called within a database transaction context.
+        """
+        snapshot = await self.export_snapshot()
+
+        async def call(function):
+            async with self.transaction(readonly=True, snapshot=snapshot):
+                return await function()
+
+        tasks = [asyncio.create_task(call(function)) for function in functions]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator["Pipeline"]:
+        """
+        Return an asynchronous context manager that provides a pipeline, in which statements
+        are queued to be sent to the database together. Upon exit of the context, if no
+        exception was raised, queued statements are executed; if not already in a
+        transaction context, they are executed in a new transaction.
+        """
+        pipeline = Pipeline(self)
+        yield pipeline
+        if self._txn.get():
+            await pipeline.flush()
+        else:
+            async with self.transaction():
+                await pipeline.flush()
+
     async def execute(
         self,
         statement: Expression,
         result: type[T] = None,
+        *,
+        prefetch: int | None = None,
+        fetch_all: bool = False,
     ) -> AsyncIterator[T] | None:
         """
         Execute a SQL statement.
@@ -439,40 +1360,359 @@ class Database(fondat.sql.Database):
         Parameters:
         • statement: SQL statement to excute
         • result: the type to return a query result row
+        • prefetch: number of rows to prefetch when reading results through a cursor
+        • fetch_all: fetch all results when statement is executed, rather than via cursor
 
         If the statement is a query that generates results, each row can be returned in
         a dataclass or TypedDict object, whose type is specifed in the `result` parameter.
-        Rows are provided via a returned asynchronous iterator.
+        Rows are provided via a returned asynchronous iterator, which also provides a
+        `fetch_batches` method to return rows in lists.
+
+        Fetching all results avoids cursor overhead for small bounded results; reading
+        results through a cursor limits the number of rows that are held in memory.
 
         Must be called within a database transaction context.
         """
-        if not self._txn.get():
-            raise RuntimeError("transaction context required to execute statement")
-        if _logger.isEnabledFor(logging.DEBUG):
-            _logger.debug(str(statement))
-        text = []
-        args = []
-        for fragment in statement:
-            if isinstance(fragment, str):
-                text.append(fragment)
-            else:
-                args.append(PostgreSQLCodec.get(fragment.type).encode(fragment.value))
-                text.append(f"${len(args)}")
-        text = "".join(text)
-        conn = self._conn.get()
         if result is None:
-            await conn.execute(text, *args)
+            await self._execute(statement)
         else:  # expecting results
-            return _Results(statement, result, conn.cursor(text, *args).__aiter__())
+            text, args = self._compile(statement)
+            conn = self._conn.get()
+            on_done = None
+            if self._instrumented and not fetch_all:
+                self._before_statement(text, len(args))
+                on_done = functools.partial(self._after_statement, text, len(args))
+            if fetch_all:
+                records = await self._run(
+                    text, len(args), len, functools.partial(conn.fetch, text, *args)
+                )
+                return _Results(statement, result, records=records, strict=self._strict)
+            cursor = functools.partial(conn.cursor, text, *args)
+            return _Results(
+                statement,
+                result,
+                cursor=cursor,
+                prefetch=prefetch,
+                strict=self._strict,
+                on_done=on_done,
+            )
+
+    async def execute_many(self, statement: Expression, args: Iterable[Sequence[Any]]) -> None:
+        """
+        Execute a SQL statement once for each sequence of parameter values.
+
+        Parameters:
+        • statement: SQL statement to execute; its parameter values are ignored
+        • args: sequences of parameter values, ordered as parameters in the statement
+
+        The statement is compiled once, and executions are sent to the database in a single
+        batch. The statement must not generate results. Must be called within a database
+        transaction context.
+        """
+        txn = self._txn.get()
+        if not txn:
+            raise RuntimeError("transaction context required to execute statement")
+        txn.statements += 1
+        text, args = self.statement_cache.compile_many(statement, args)
+        self._log_statement(text, args, True)
+        await self._run(
+            text,
+            len(args[0]) if args else 0,
+            lambda _: len(args),
+            functools.partial(self._conn.get().executemany, text, args),
+        )
+
+    def _compile(self, statement: Expression) -> tuple[str, list[Any]]:
+        """Return compiled text and encoded arguments for a statement to be executed."""
+        txn = self._txn.get()
+        if not txn:
+            raise RuntimeError("transaction context required to execute statement")
+        txn.statements += 1
+        text, args = self.statement_cache.compile(statement)
+        self._log_statement(text, args)
+        return text, args
+
+    def _log_statement(self, text: str, args: Sequence[Any], many: bool = False) -> None:
+        """
+        Log a compiled statement at debug level, if enabled and sampled.
+
+        Statements are logged to a logger named for the statement command; for example,
+        "fondat.postgresql.statement.select". Messages contain compiled statement text and
+        a truncated list of parameter values, and are only rendered if emitted.
+        """
+        logger = _statement_logger(text)
+        if logger.isEnabledFor(logging.DEBUG) and (
+            self._debug_sample_rate >= 1.0 or random.random() < self._debug_sample_rate
+        ):
+            logger.debug("%s", _LogStatement(text, args, many))
+
+    async def _execute(self, statement: Expression) -> str:
+        """Execute a statement that generates no results, returning its command status."""
+        text, args = self._compile(statement)
+        if not self._instrumented:
+            return await self._conn.get().execute(text, *args)
+        return await self._run(
+            text, len(args), _rowcount, functools.partial(self._conn.get().execute, text, *args)
+        )
+
+    async def _run(
+        self,
+        text: str,
+        params: int,
+        rows: Callable[[Any], int],
+        operation: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Perform a database operation for a compiled statement, calling execute hooks and
+        recording measurements.
+
+        Parameters:
+        • text: compiled statement text
+        • params: number of statement parameters
+        • rows: function to return the number of rows from the result of the operation
+        • operation: function to perform the operation
+        """
+        if not self._instrumented:
+            return await operation()
+        self._before_statement(text, params)
+        start = time.perf_counter()
+        result = await operation()
+        self._after_statement(text, params, time.perf_counter() - start, rows(result))
+        return result
+
+    @property
+    def _instrumented(self) -> bool:
+        """Return if statement executions are to be timed."""
+        return bool(
+            self._metrics is not None
+            or self._slow_query_threshold is not None
+            or self.before_execute
+            or self.after_execute
+        )
+
+    def _before_statement(self, text: str, params: int) -> None:
+        """Call hooks before a statement is executed."""
+        for hook in self.before_execute:
+            try:
+                hook(text, params)
+            except Exception:
+                _logger.exception("before execute hook failed")
+
+    def _after_statement(self, text: str, params: int, duration: float, rows: int) -> None:
+        """
+        Record the execution of a statement, and call hooks after it is executed. Slow
+        statements are logged as warnings to the "fondat.postgresql.slow" logger.
+        """
+        if self._metrics is not None:
+            self._emit("statement.duration", duration)
+            self._emit("statement.rows", rows)
+        for hook in self.after_execute:
+            try:
+                hook(text, params, duration, rows)
+            except Exception:
+                _logger.exception("after execute hook failed")
+        if (
+            self._slow_query_threshold is not None
+            and duration >= self._slow_query_threshold
+            and random.random() < self._slow_query_sample_rate
+        ):
+            _slow_logger.warning(
+                "slow statement (%.3fs, %d params, %d rows): %s", duration, params, rows, text
+            )
+
+    async def copy_in(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        records: Iterable[Sequence[Any]] | AsyncIterable[Sequence[Any]],
+    ) -> int:
+        """
+        Copy records into a table using the binary COPY protocol.
+
+        Parameters:
+        • table_name: name of table to copy records into, optionally schema-qualified
+        • columns: names of columns that values in each record correspond to
+        • records: iterable or asynchronous iterable of records containing encoded values
+
+        Returns the number of records copied. Must be called within a database transaction
+        context.
+        """
+        txn = self._txn.get()
+        if not txn:
+            raise RuntimeError("transaction context required to copy records")
+        txn.statements += 1
+        text = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN (FORMAT binary)"
+        schema_name, _, table_name = table_name.rpartition(".")
+        status = await self._run(
+            text,
+            0,
+            _rowcount,
+            functools.partial(
+                self._conn.get().copy_records_to_table,
+                table_name,
+                records=records,
+                columns=list(columns),
+                schema_name=schema_name or None,
+            ),
+        )
+        return _rowcount(status)
+
+    async def copy_out(
+        self,
+        statement: Expression,
+        sink: Any,
+        *,
+        format: Literal["csv", "text", "binary"] = "csv",
+        header: bool = False,
+    ) -> int:
+        """
+        Copy the results of a query to a sink using the COPY protocol.
+
+        Parameters:
+        • statement: query statement whose results are to be copied
+        • sink: path, file-like object, or coroutine function that accepts bytes
+        • format: format of data to copy to sink
+        • header: include header line with column names (csv format only)
+
+        Data is written to the sink as it is received from the database, without decoding
+        rows into Python objects. Returns the number of rows copied. Must be called within a
+        database transaction context.
+        """
+        text, args = self._compile(statement)
+        status = await self._run(
+            text,
+            len(args),
+            _rowcount,
+            functools.partial(
+                self._conn.get().copy_from_query,
+                text.rstrip().rstrip(";"),
+                *args,
+                output=sink,
+                format=format,
+                header=header if format == "csv" else None,
+            ),
+        )
+        return _rowcount(status)
 
     def sql_type(self, type: Any) -> str:
         """Return the SQL type string that corresponds with the specified Python type."""
         return PostgreSQLCodec.get(type).sql_type
 
 
+class Pipeline:
+    """
+    Queues statements to be sent to a database together.
+
+    Consecutive statements with the same compiled text are sent in a single batch of
+    executions; consecutive statements without parameters are sent in a single query.
+    Statements must not generate results.
+    """
+
+    __slots__ = {"database", "statements"}
+
+    def __init__(self, database: Database):
+        self.database = database
+        self.statements = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def execute(self, statement: Expression) -> None:
+        """Queue a statement to be executed when the pipeline is flushed."""
+        self.statements.append(statement)
+
+    async def flush(self) -> None:
+        """
+        Execute queued statements, and clear the queue. Must be called within a database
+        transaction context.
+        """
+        statements, self.statements = self.statements, []
+        compiled = [self.database._compile(statement) for statement in statements]
+        conn = self.database._conn.get()
+        run = self.database._run
+        for text, group in itertools.groupby(compiled, key=lambda c: c[0] if c[1] else None):
+            group = list(group)
+            if text is None:  # no parameters
+                # separator on its own line, in case a statement ends with a comment
+                text = "\n;\n".join(t.rstrip().rstrip(";") for t, _ in group)
+                await run(text, 0, lambda _: len(group), functools.partial(conn.execute, text))
+            elif len(group) == 1:
+                args = group[0][1]
+                await run(
+                    text, len(args), _rowcount, functools.partial(conn.execute, text, *args)
+                )
+            else:
+                args = [args for _, args in group]
+                await run(
+                    text,
+                    len(args[0]),
+                    lambda _: len(args),
+                    functools.partial(conn.executemany, text, args),
+                )
+
+
 class Table(fondat.sql.Table[Schema]):
     """..."""
 
+    def __init__(self, name: str, database: Database, schema: type[Schema], pk: str):
+        super().__init__(name, database, schema, pk)
+        self._row_types = {}  # columns → row type
+
+    async def select(
+        self,
+        *,
+        columns: Iterable[str] | str | None = None,
+        where: Expression | None = None,
+        order_by: Iterable[str] | str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Execute a SQL statement select rows from the table.
+
+        Parameters:
+        • columns: name(s) of column(s) to return, or None for all columns
+        • where: statement containing WHERE expression, or None to match all rows
+        • order_by: names of columns to order rows by, or None to not order rows
+        • limit: limit the number of rows returned, or None to not limit
+        • offset: number of rows to skip, or None to skip none
+
+        Returns an asynchronous iterable for rows in table that match the where expression.
+        Each row item is a dictionary that maps column name to value.
+
+        Must be called within a database transaction context.
+        """
+
+        if isinstance(columns, str):
+            columns = columns.replace(",", " ").split()
+
+        columns = tuple(self.columns.keys() if columns is None else columns)
+
+        if order_by is not None and not isinstance(order_by, str):
+            order_by = ", ".join(order_by)
+
+        async for row in fondat.sql.select_iterator(
+            database=self.database,
+            columns={column: Expression(column) for column in columns},
+            from_=Expression(self.name),
+            where=where,
+            order_by=Expression(order_by) if order_by is not None else None,
+            limit=limit,
+            offset=offset,
+            row_type=self._row_type(columns),
+        ):
+            yield row
+
+    def _row_type(self, columns: tuple[str, ...]) -> type:
+        """Return a TypedDict type for rows with the specified columns, reused across calls."""
+        try:
+            return self._row_types[columns]
+        except KeyError:
+            row_type = self._row_types[columns] = TypedDict(
+                "Row", {c: self.columns[c] for c in columns}
+            )
+            return row_type
+
     async def upsert(self, value: Schema):
         """
         Upsert table row. Must be called within a database transaction context.
@@ -501,6 +1741,348 @@ class Table(fondat.sql.Table[Schema]):
         )
         await self.database.execute(stmt)
 
+    async def upsert_many(self, values: Iterable[Schema], batch_size: int = 1000) -> int:
+        """
+        Upsert multiple table rows, using a multi-row statement for each batch of rows.
+        Must be called within a database transaction context.
+
+        Parameters:
+        • values: rows to upsert
+        • batch_size: maximum number of rows to upsert in each statement
+
+        If a batch contains multiple rows with the same primary key, only the last of those
+        rows is upserted. Returns the number of rows inserted or updated.
+        """
+        batch_size = max(1, min(batch_size, _MAX_PARAMS // len(self.columns)))
+        values = iter(values)
+        count = 0
+        while batch := list(itertools.islice(values, batch_size)):
+            rows = {getattr(value, self.pk): value for value in batch}.values()
+            stmt = Expression(
+                f"INSERT INTO {self.name} (",
+                ", ".join(self.columns),
+                ") VALUES ",
+                Expression.join(
+                    (
+                        Expression(
+                            "(",
+                            Expression.join(
+                                (
+                                    Param(getattr(row, name), python_type)
+                                    for name, python_type in self.columns.items()
+                                ),
+                                ", ",
+                            ),
+                            ")",
+                        )
+                        for row in rows
+                    ),
+                    ", ",
+                ),
+                f" ON CONFLICT ({self.pk}) DO ",
+            )
+            updates = [f"{name} = EXCLUDED.{name}" for name in self.columns if name != self.pk]
+            stmt += f"UPDATE SET {', '.join(updates)};" if updates else "NOTHING;"
+            count += _rowcount(await self.database._execute(stmt))
+        return count
+
+    async def copy_in(self, values: Iterable[Schema] | AsyncIterable[Schema]) -> int:
+        """
+        Insert rows into the table using the binary COPY protocol. Must be called within a
+        database transaction context.
+
+        Parameters:
+        • values: iterable or asynchronous iterable of rows to insert
+
+        Returns the number of rows inserted.
+        """
+        columns = [(name, PostgreSQLCodec.get(t).encode) for name, t in self.columns.items()]
+
+        def encode(value: Schema) -> tuple[Any, ...]:
+            return tuple(encode(getattr(value, name)) for name, encode in columns)
+
+        if isinstance(values, AsyncIterable):
+
+            async def aencode():
+                async for value in values:
+                    yield encode(value)
+
+            records = aencode()
+        else:
+            records = (encode(value) for value in values)
+        # unquoted identifiers in table creation are folded to lower case
+        return await self.database.copy_in(
+            self.name.lower(), [name.lower() for name in self.columns], records
+        )
+
+    async def export(
+        self,
+        sink: Any,
+        *,
+        columns: Iterable[str] | str | None = None,
+        where: Expression | None = None,
+        order_by: Iterable[str] | str | None = None,
+        format: Literal["csv", "text", "binary"] = "csv",
+        header: bool = False,
+    ) -> int:
+        """
+        Export table rows to a sink using the COPY protocol. Must be called within a
+        database transaction context.
+
+        Parameters:
+        • sink: path, file-like object, or coroutine function that accepts bytes
+        • columns: name(s) of column(s) to export, or None for all columns
+        • where: statement containing WHERE expression, or None to export all rows
+        • order_by: names of columns to order rows by, or None to not order rows
+        • format: format of data to export to sink
+        • header: include header line with column names (csv format only)
+
+        Returns the number of rows exported.
+        """
+        if isinstance(columns, str):
+            columns = columns.replace(",", " ").split()
+        if columns is None:
+            columns = self.columns.keys()
+        if order_by is not None and not isinstance(order_by, str):
+            order_by = ", ".join(order_by)
+        stmt = Expression(f"SELECT {', '.join(columns)} FROM {self.name}")
+        if where is not None:
+            stmt += Expression(" WHERE ", where)
+        if order_by is not None:
+            stmt += f" ORDER BY {order_by}"
+        return await self.database.copy_out(stmt, sink, format=format, header=header)
+
+    async def parallel_scan(
+        self,
+        partitions: int = 4,
+        *,
+        key: Literal["ctid", "pk"] = "ctid",
+        columns: Iterable[str] | str | None = None,
+        where: Expression | None = None,
+        ordered: bool = False,
+        buffer: int = 1000,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Select rows from the table, reading partitions of the table concurrently.
+
+        Parameters:
+        • partitions: number of partitions to read concurrently
+        • key: partition by ranges of physical row location, or of primary key
+        • columns: name(s) of column(s) to return, or None for all columns
+        • where: statement containing WHERE expression, or None to match all rows
+        • ordered: return rows in partition order; partitioned by primary key, this
+          returns rows ordered by primary key
+        • buffer: maximum number of rows read ahead for each partition
+
+        Returns an asynchronous iterable for rows in table that match the where expression.
+        Each row item is a dictionary that maps column name to value.
+
+        Each partition is read on its own connection from the primary database pool, in a
+        transaction that shares a snapshot with the others. Rows are read independently of
+        any transaction in the current context; its uncommitted changes are not returned.
+        The number of partitions should be less than the maximum size of the pool. To stop
+        iterating before all rows are returned, the iterator should be closed (for example,
+        using `contextlib.aclosing`) to release partition connections promptly.
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        queues = [asyncio.Queue(buffer) for _ in range(partitions if ordered else 1)]
+        done = object()  # partition read
+
+        async def read(where: Expression | None, queue: asyncio.Queue, snapshot: str):
+            async with self.database.transaction(readonly=True, snapshot=snapshot):
+                async for row in self.select(
+                    columns=columns,
+                    where=where,
+                    order_by=self.pk if ordered and key == "pk" else None,
+                ):
+                    await queue.put(row)
+            await queue.put(done)
+
+        async def scan():
+            async with self.database.transaction(isolation="repeatable_read"):
+                snapshot = await self.database.export_snapshot()
+                ranges = await self._partition_ranges(partitions, key)
+                if where is not None:
+                    ranges = [
+                        Expression("(", where, ")", *((" AND ", r) if r else ()))
+                        for r in ranges
+                    ]
+                tasks = [
+                    asyncio.create_task(read(r, queues[n] if ordered else queues[0], snapshot))
+                    for n, r in enumerate(ranges)
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
+
+        def scanned(task: asyncio.Task):
+            if not task.cancelled() and task.exception():
+                for queue in queues:  # discard read ahead rows to report exception
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(task.exception())
+
+        task = asyncio.create_task(scan())
+        task.add_done_callback(scanned)
+        try:
+            for queue in queues:
+                remaining = 1 if ordered else partitions
+                while remaining:
+                    row = await queue.get()
+                    if row is done:
+                        remaining -= 1
+                    elif isinstance(row, BaseException):
+                        raise row
+                    else:
+                        yield row
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _partition_ranges(
+        self, partitions: int, key: Literal["ctid", "pk"]
+    ) -> list[Expression | None]:
+        """Return expressions selecting each partition of the table."""
+        stmt = Expression(
+            "SELECT pg_relation_size(",
+            Param(self.name),
+            "::TEXT::REGCLASS) / current_setting('block_size')::INTEGER AS blocks;",
+        )
+        TD = TypedDict("TD", {"blocks": int})
+        result = await self.database.execute(stmt, TD, fetch_all=True)
+        blocks = (await result.__anext__())["blocks"]
+        if key == "ctid":
+            step = max(-(-blocks // partitions), 1)
+            bounds = [Expression(f"ctid < '({step * n},0)'::TID") for n in range(1, partitions)]
+            lower = [Expression(f"ctid >= '({step * n},0)'::TID") for n in range(1, partitions)]
+        else:
+            # estimate key boundaries from a sample of table blocks, rather than all rows
+            percent = min(100.0, 100.0 * _SAMPLE_BLOCKS * partitions / max(blocks, 1))
+            fractions = ", ".join(str(n / partitions) for n in range(1, partitions))
+            stmt = Expression(
+                f"SELECT percentile_disc(ARRAY[{fractions}]::DOUBLE PRECISION[]) ",
+                f"WITHIN GROUP (ORDER BY {self.pk}) AS bounds ",
+                f"FROM {self.name} TABLESAMPLE SYSTEM ({percent});",
+            )
+            TD = TypedDict("TD", {"bounds": list[self.columns[self.pk]] | None})
+            result = await self.database.execute(stmt, TD, fetch_all=True)
+            values = list(dict.fromkeys((await result.__anext__())["bounds"] or ()))
+            if not values:  # no sampled rows; read in a single partition
+                return [None] + [Expression("FALSE")] * (partitions - 1)
+            values += values[-1:] * (partitions - 1 - len(values))  # empty partitions
+            pk_type = self.columns[self.pk]
+            bounds = [Expression(f"{self.pk} < ", Param(v, pk_type)) for v in values]
+            lower = [Expression(f"{self.pk} >= ", Param(v, pk_type)) for v in values]
+        ranges = []
+        for n in range(len(bounds) + 1):
+            conditions = []
+            if n > 0:
+                conditions.append(lower[n - 1])
+            if n < len(bounds):
+                conditions.append(bounds[n])
+            ranges.append(Expression.join(conditions, " AND ") if conditions else None)
+        return ranges
+
+    async def paginate(
+        self,
+        *,
+        order_by: "Iterable[str] | str | Index | None" = None,
+        page_size: int = 100,
+        after: Cursor = None,
+        columns: Iterable[str] | str | None = None,
+        where: Expression | None = None,
+    ) -> Page[dict[str, Any]]:
+        """
+        Select a page of rows from the table, using keyset pagination.
+
+        Parameters:
+        • order_by: names of columns, or index whose keys are columns, to order rows by
+        • page_size: maximum number of rows to return in the page
+        • after: cursor of the previous page, or None to return the first page
+        • columns: name(s) of column(s) to return, or None for all columns
+        • where: statement containing WHERE expression, or None to match all rows
+
+        Returns a page of rows that match the where expression, each row item being a
+        dictionary that maps column name to value. If there are further rows, the page
+        contains a cursor to request the next page.
+
+        Rows are ordered in ascending order of the specified columns, followed by the
+        primary key, which is included to make the order unique. Each page is selected by
+        comparing these columns with values of the last row of the previous page, rather
+        than by skipping rows; for efficiency, an index should exist on the columns. The
+        order columns must not contain null values.
+
+        Must be called within a database transaction context.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if isinstance(order_by, Index):
+            order_by = order_by.keys
+        if isinstance(order_by, str):
+            order_by = order_by.replace(",", " ").split()
+        keys = list(order_by or ())
+        if any(key not in self.columns for key in keys):
+            raise ValueError("order_by must contain only column names")
+        if self.pk not in keys:
+            keys.append(self.pk)
+        if isinstance(columns, str):
+            columns = columns.replace(",", " ").split()
+        columns = tuple(self.columns.keys() if columns is None else columns)
+        if after is not None:
+            seek = Expression(
+                f"({', '.join(keys)}) > (",
+                Expression.join(
+                    (
+                        Param(value, self.columns[key])
+                        for key, value in zip(keys, self._decode_cursor(after, keys))
+                    ),
+                    ", ",
+                ),
+                ")",
+            )
+            where = seek if where is None else Expression("(", where, ") AND ", seek)
+        rows = [
+            row
+            async for row in self.select(
+                columns=columns + tuple(k for k in keys if k not in columns),
+                where=where,
+                order_by=keys,
+                limit=page_size + 1,
+            )
+        ]
+        cursor = None
+        if len(rows) > page_size:
+            del rows[page_size:]
+            cursor = self._encode_cursor(rows[-1], keys)
+        if any(key not in columns for key in keys):
+            rows = [{c: row[c] for c in columns} for row in rows]
+        return Page(items=rows, cursor=cursor)
+
+    def _encode_cursor(self, row: Mapping[str, Any], keys: list[str]) -> bytes:
+        """Return a cursor containing the key values of a row."""
+        values = [JSONCodec.get(self.columns[key]).encode(row[key]) for key in keys]
+        return json.dumps(values, separators=(",", ":")).encode()
+
+    def _decode_cursor(self, cursor: bytes, keys: list[str]) -> list[Any]:
+        """Return the key values contained in a cursor."""
+        try:
+            values = json.loads(cursor)
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise ValueError
+            return [
+                JSONCodec.get(self.columns[key]).decode(value)
+                for key, value in zip(keys, values)
+            ]
+        except (ValueError, TypeError, DecodeError) as e:
+            raise PaginationError("invalid cursor") from e
+
 
 @dataclass
 class Index(fondat.sql.Index):